@@ -9,6 +9,7 @@ from tkintertester import harness
 # Application state
 app = {
     "count": 0,
+    "count_str": "0",  # text last put on the label; tests read this, not Tk
     "toplevel": None,
 }
 
@@ -16,8 +17,16 @@ widgets = {}
 
 
 def entry():
-    """Set up the counter app."""
+    """Set up the counter app.
+
+    The window is built on the first call only.  Between tests,
+    reset_state() puts it back to its initial state instead.
+    """
+    if app["toplevel"] is not None:
+        return
+
     app["count"] = 0
+    app["count_str"] = "0"
 
     app["toplevel"] = tkinter.Toplevel(harness.g["root"])
     app["toplevel"].title("Counter")
@@ -38,12 +47,22 @@ def entry():
     widgets["button"].grid(row=1, column=0, padx=20, pady=10)
 
 def handle_when_user_closes_window():
-    app["toplevel"].destroy()
+    reset()
     harness.quit()
 
 
+def reset_state():
+    """Reset app state between tests, keeping the window."""
+    if app["toplevel"] is None:
+        return  # window was closed; the next entry() rebuilds it
+
+    app["count"] = 0
+    app["count_str"] = "0"
+    widgets["label"].config(text="0")
+
+
 def reset():
-    """Reset app between tests."""
+    """Tear down the window, for tests that change the widget tree."""
     if app["toplevel"] is not None:
         app["toplevel"].destroy()
         app["toplevel"] = None
@@ -53,12 +72,19 @@ def reset():
 
 def handle_when_user_clicks_increment():
     app["count"] += 1
-    widgets["label"].config(text=str(app["count"]))
+    app["count_str"] = str(app["count"])
+    widgets["label"].config(text=app["count_str"])
 
 
 # Tests
+#
+# "Increment once" drives the real button with invoke(), covering the Tk
+# command binding.  "Increment three times" exercises the increment logic
+# by calling the handler directly, skipping the Tcl round-trip per click.
 
 def test_initial_state():
+    # Reads the label through Tk, to catch the label and app["count_str"]
+    # drifting apart; the other tests compare app["count_str"].
     def step_check_initial_value():
         if widgets["label"].cget("text") == "0":
             return ("success", None)
@@ -73,66 +99,61 @@ def test_increment_once():
         return ("next", None)
 
     def step_verify_count():
-        if widgets["label"].cget("text") == "1":
+        if app["count_str"] == "1":
             return ("success", None)
-        return ("fail", f"Expected '1', got '{widgets['label'].cget('text')}'")
+        return ("fail", f"Expected '1', got '{app['count_str']}'")
 
     return [step_click_button, step_verify_count]
 
 
 def test_increment_three_times():
-    def step_click_three_times():
-        widgets["button"].invoke()
-        widgets["button"].invoke()
-        widgets["button"].invoke()
+    def step_increment_three_times():
+        for _ in range(3):
+            handle_when_user_clicks_increment()
         return ("next", None)
 
     def step_verify_count():
-        if widgets["label"].cget("text") == "3":
+        if app["count_str"] == "3":
             return ("success", None)
-        return ("fail", f"Expected '3', got '{widgets['label'].cget('text')}'")
+        return ("fail", f"Expected '3', got '{app['count_str']}'")
 
-    return [step_click_three_times, step_verify_count]
+    return [step_increment_three_times, step_verify_count]
 
 
 def test_visual_slow_increment():
+    # widgets is filled in by entry(), after the steps are built, so the
+    # button is looked up once the test is running.
+    state = {"button": None, "clicks": 0}
+
     def step_show_window():
+        state["button"] = widgets["button"]
         return ("next", 500)
 
-    def step_click_and_wait_1():
-        widgets["button"].invoke()
-        return ("next", 400)
-
-    def step_click_and_wait_2():
-        widgets["button"].invoke()
-        return ("next", 400)
-
-    def step_click_and_wait_3():
-        widgets["button"].invoke()
+    def step_click_and_wait():
+        state["button"].invoke()
+        state["clicks"] += 1
+        if state["clicks"] < 3:
+            return ("wait", 400)  # repeat this step
         return ("next", 400)
 
     def step_verify_and_pause():
-        if widgets["label"].cget("text") == "3":
+        if app["count_str"] == "3":
             return ("success", 500)
-        return ("fail", f"Expected '3', got '{widgets['label'].cget('text')}'")
+        return ("fail", f"Expected '3', got '{app['count_str']}'")
 
-    return [
-        step_show_window,
-        step_click_and_wait_1,
-        step_click_and_wait_2,
-        step_click_and_wait_3,
-        step_verify_and_pause,
-    ]
+    return [step_show_window, step_click_and_wait, step_verify_and_pause]
 
 
 if __name__ == "__main__":
-    harness.set_resetfn(reset)
+    harness.set_resetfn(reset_state)
     harness.set_timeout(5000)
 
-    harness.add_test("Initial state is zero", test_initial_state())
-    harness.add_test("Increment once", test_increment_once())
-    harness.add_test("Increment three times", test_increment_three_times())
-    harness.add_test("Visual: slow increment", test_visual_slow_increment())
+    harness.add_tests([
+        ("Initial state is zero", test_initial_state()),
+        ("Increment once", test_increment_once()),
+        ("Increment three times", test_increment_three_times()),
+        ("Visual: slow increment", test_visual_slow_increment()),
+    ])
 
     harness.run_host(entry, "x")  # You can take out "x" too, to just leave it running.
 
@@ -7,8 +7,10 @@ Public API intentionally small:
     - run_host
     - attach_harness
     - add_test
+    - add_tests
     - set_timeout
     - set_resetfn
+    - configure
     - quit
     - print_results
     - write_results
@@ -23,8 +25,10 @@ from .harness import (
     run_host,
     attach_harness,
     add_test,
+    add_tests,
     set_timeout,
     set_resetfn,
+    configure,
     quit,
     get_results,
     print_results,
@@ -37,8 +41,10 @@ __all__ = [
     "run_host",
     "attach_harness",
     "add_test",
+    "add_tests",
     "set_timeout",
     "set_resetfn",
+    "configure",
     "quit",
     "get_results",
     "print_results",
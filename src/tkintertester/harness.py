@@ -1,22 +1,58 @@
 """harness.py - Test execution, scheduling, timeouts, and result recording."""
 
+import collections
 import json
+import sys
 import tkinter
 import time
 import traceback
 
 
+# Step actions -- interned, so kACTIONS lookups on literal returns match by identity
+NEXT = sys.intern("next")
+SUCCESS = sys.intern("success")
+WAIT = sys.intern("wait")
+FAIL = sys.intern("fail")
+GOTO = sys.intern("goto")
+
+
+# What an action handler did with the step's value (None: test concluded)
+INLINE = "inline"        # the next step should run now, in this callback
+SCHEDULED = "scheduled"  # a timer will resume the test
+
+
+# Zero-delay steps run back-to-back before yielding to the Tk event loop
+kMAX_INLINE_STEPS = 64
+
+
+# Settings that configure() may set in g
+kCONFIG_KEYS = ("timeout_ms", "app_reset")
+
+
+# Indent of a failure message under its test line in the text report
+kFAIL_MESSAGE_INDENT = " " * 9
+
+
 # Tests list - never rebound, contents updated with results
 tests = []
 
+# Tcl command names of the harness callbacks, registered once per root
+# ("step", "success", "timeout", "pump") - never rebound
+tcl_commands = {}
+
+# Zero-delay harness work, drained in FIFO order by _pump() - never rebound
+pending_calls = collections.deque()
+
 # Glanceable state
 g = {
     "root": None,                     # Hidden Tk root window
+    "tcl_call": None,                 # root.tk.call, bound once on attach
+    "pump_scheduled": False,          # Flag: an after_idle(_pump) is pending
     "current_test": None,             # Currently executing test dict
     "current_step_index": 0,          # Index within current test's steps
     "test_done": False,               # Flag: current test completed
-    "current_timeout_after_id": None, # Tk after() id for timeout
-    "start_time": None,               # Timestamp when current test started
+    "test_generation": 0,             # Bumped per test; stale timers compare against it
+    "start_time": None,               # time.monotonic() when current test started
     "test_index": 0,                  # Index into tests list
     "app_entry": None,                # Application entry function
     "app_reset": None,                # Application reset function (for next test)
@@ -33,21 +69,56 @@ def set_timeout(timeout_ms):
 def set_resetfn(app_reset):
     g["app_reset"] = app_reset
 
+def configure(settings):
+    """Set several harness settings at once from a dict.
+
+    Recognized keys: "timeout_ms", "app_reset".  Unknown keys raise KeyError
+    and nothing is set.
+    """
+    for key in settings:
+        if key not in kCONFIG_KEYS:
+            raise KeyError(key)
+    g.update(settings)
+
 def add_test(title, steps, flags=""):
     """Register a test by appending to the global tests list.
 
     flags:
       "q" -- test expects the app to call harness.quit(); won't auto-fail on quit.
+      "y" -- (s"y"nchronous) run every step back-to-back in a single Tk
+             callback, with no timeout timer.  Steps may not ask for a delay
+             ("wait", or "next"/"success" with any ms, even 0);
+             doing so fails the test.
+    """
+    tests.append(_make_test(title, steps, flags))
+
+
+def add_tests(items):
+    """Register several tests at once.
+
+    items: iterable of (title, steps) or (title, steps, flags) tuples,
+    with the same meaning as the arguments to add_test.
     """
-    test = {
+    tests.extend(_make_test(*item) for item in items)
+
+
+def _make_test(title, steps, flags=""):
+    """Build a test dict.
+
+    Every field, including the result fields, is created here, so the dict
+    never grows while the test runs and readers can index it directly.
+    """
+    return {
         "title": title,
-        "steps": list(steps),  # defensive copy
+        "steps": tuple(steps),  # defensive copy
         "status": None,
         "fail_message": None,
         "exception": None,
+        "exc_info": None,
+        "duration_ms": None,
         "allows_quit": "q" in flags,
+        "is_synchronous": "y" in flags,
     }
-    tests.append(test)
 
 
 def quit():
@@ -108,18 +179,74 @@ def attach_harness(root, flags=""):
 def _attach_harness(root):
     """Attach harness scheduling onto an existing Tk root."""
 
+    # Register the harness commands once per root; re-attaching reuses them
+    if root is not g["root"] or not tcl_commands:
+        tcl_commands["step"] = root.register(_handle_when_step_delay_ends)
+        tcl_commands["success"] = root.register(_handle_when_success_delay_ends)
+        tcl_commands["timeout"] = root.register(_handle_when_current_test_times_out)
+        tcl_commands["pump"] = root.register(_pump)
+
     g["root"] = root
+    g["tcl_call"] = root.tk.call
     g["test_index"] = 0
+    g["pump_scheduled"] = False
+    pending_calls.clear()
 
     def _report_callback_exception(exc, val, tb):
-        if g.get("current_test") and not g.get("test_done"):
+        if g["current_test"] is not None and not g["test_done"]:
             message = f"Tk callback exception: {val}"
-            _mark_fail(message, "".join(traceback.format_exception(exc, val, tb)))
+            _mark_fail(message, (exc, val, tb))
         else:
             traceback.print_exception(exc, val, tb)
 
     root.report_callback_exception = _report_callback_exception
-    root.after_idle(_advance_to_next_test)
+    _push(_advance_to_next_test)
+
+
+def _schedule(delay, command):
+    """Schedule a registered harness command after delay ms.
+
+    Calls Tcl's after directly with the pre-registered command name, so no
+    Tcl command is created and deleted per scheduled call.  A zero delay goes
+    on the idle queue rather than the timer queue.  The command is passed the
+    current test generation, so that if it outlives its test it can tell
+    (see _is_stale) and do nothing; nothing is ever cancelled.
+    """
+    if delay == 0:
+        delay = "idle"
+    g["tcl_call"]("after", delay, tcl_commands[command], g["test_generation"])
+
+
+def _schedule_pump():
+    g["pump_scheduled"] = True
+    g["tcl_call"]("after", "idle", tcl_commands["pump"])
+
+
+def _is_stale(generation):
+    """True if a timer scheduled with generation belongs to an earlier test."""
+    return int(generation) != g["test_generation"]
+
+
+def _push(fn):
+    """Queue fn to run on the next pump, scheduling the pump if needed."""
+    pending_calls.append(fn)
+    if not g["pump_scheduled"]:
+        _schedule_pump()
+
+
+def _pump():
+    """Run the calls queued before this pump began.
+
+    Calls pushed while pumping wait for the next pump, so Tk gets to service
+    its events between rounds.
+    """
+    g["pump_scheduled"] = False
+    try:
+        for _ in range(len(pending_calls)):
+            pending_calls.popleft()()
+    finally:
+        if pending_calls and not g["pump_scheduled"]:
+            _schedule_pump()
 
 
 def _advance_to_next_test():
@@ -147,62 +274,143 @@ def _advance_to_next_test():
     g["current_test"] = tests[g["test_index"]]
     g["current_step_index"] = 0
     g["test_done"] = False
-    g["start_time"] = time.time()
+    g["start_time"] = time.monotonic()
 
-    g["current_timeout_after_id"] = g["root"].after(
-        g["timeout_ms"],
-        _handle_when_current_test_times_out
-    )
+    g["test_generation"] += 1
+    is_synchronous = g["current_test"]["is_synchronous"]
+
+    if not is_synchronous:
+        _schedule(g["timeout_ms"], "timeout")
     
     if g["app_entry"]:
         g["app_entry"]()
     
-    g["root"].after(0, _execute_current_step)
+    if is_synchronous:
+        _run_current_test_synchronously()
+    else:
+        _push(_execute_current_step)
+
+
+def _run_current_test_synchronously():
+    """Run a synchronous ("y") test to its conclusion in this callback.
+
+    No timeout timer is scheduled; instead the elapsed time is checked after
+    every step, so a "goto" loop still ends in a timeout.
+    """
+    deadline = g["start_time"] + g["timeout_ms"] / 1000
+
+    while not g["test_done"]:
+        taken = _take_current_step()
+        if taken is None:
+            return
+
+        action, value, do_action = taken
+
+        if do_action(value) is SCHEDULED:
+            # The timer it set is harmless: the test is done when it fires
+            _mark_fail(f"Synchronous test step asked for a delay: {action}")
+            return
+
+        if time.monotonic() > deadline:
+            _time_out_current_test()
 
 
 def _execute_current_step():
-    """Execute the current step and handle its return value."""
-    if g["test_done"]:
-        return
+    """Execute steps until one asks for a delay or the test concludes.
 
-    test = g["current_test"]
-    steps = test["steps"]
+    ("next", None) and "goto" run the following step inline, without a
+    round-trip through the Tk event queue.  After kMAX_INLINE_STEPS inline
+    steps, the harness yields once through the pump so Tk can service events.
+    """
+    for _ in range(kMAX_INLINE_STEPS):
+        if g["test_done"]:
+            return
 
-    if g["current_step_index"] >= len(steps):
-        _mark_success()
-        return
+        taken = _take_current_step()
+        if taken is None:
+            return
 
-    step_fn = steps[g["current_step_index"]]
+        action, value, do_action = taken
+
+        # Fast path for the usual test ending, ("success", None)
+        if action is SUCCESS and value is None and not g["test_done"]:
+            g["test_done"] = True
+            g["current_test"]["status"] = "success"
+            _finish_current_test()
+            return
+
+        if do_action(value) is not INLINE:
+            return
+
+    # The last inline step may itself have ended the test (quit(), a Tk
+    # callback exception); then the next test is already queued.
+    if not g["test_done"]:
+        _push(_execute_current_step)
+
+
+def _take_current_step():
+    """Call the current step and return (action, value, do_action).
+
+    Returns None instead when the test concluded: the steps were exhausted,
+    the step raised, or it returned an unknown action.
+    """
+    steps = g["current_test"]["steps"]
+    index = g["current_step_index"]
+
+    if index >= len(steps):
+        _mark_success()
+        return None
 
     try:
-        action, value = step_fn()
+        action, value = steps[index]()
     except Exception:
-        _mark_fail("Exception in step", traceback.format_exc())
-        return
+        _mark_fail("Exception in step", sys.exc_info())
+        return None
 
-    if action == "fail":
-        _mark_fail(value)
+    do_action = kACTIONS.get(action) if isinstance(action, str) else None
+    if do_action is None:
+        _mark_fail(f"Unknown action: {action}")
+        return None
 
-    elif action == "success":
-        if value is None:
-            _mark_success()
-        else:
-            g["root"].after(value, _mark_success)
+    return action, value, do_action
 
-    elif action == "next":
-        g["current_step_index"] += 1
-        delay = 0 if value is None else value
-        g["root"].after(delay, _execute_current_step)
 
-    elif action == "wait":
-        g["root"].after(value, _execute_current_step)
+# Action handlers return INLINE, SCHEDULED, or None (test concluded).
 
-    elif action == "goto":
-        g["current_step_index"] = value
-        g["root"].after(0, _execute_current_step)
+def _do_next(value):
+    g["current_step_index"] += 1
+    if value is None:
+        return INLINE
+    _schedule(value, "step")
+    return SCHEDULED
+
+def _do_success(value):
+    if value is None:
+        _mark_success()
+        return None
+    _schedule(value, "success")
+    return SCHEDULED
+
+def _do_wait(value):
+    _schedule(value, "step")
+    return SCHEDULED
+
+def _do_fail(value):
+    _mark_fail(value)
+
+def _do_goto(value):
+    g["current_step_index"] = value
+    return INLINE
 
-    else:
-        _mark_fail(f"Unknown action: {action}")
+
+# Step return actions -> handlers
+kACTIONS = {
+    NEXT: _do_next,
+    SUCCESS: _do_success,
+    WAIT: _do_wait,
+    FAIL: _do_fail,
+    GOTO: _do_goto,
+}
 
 
 def _mark_success():
@@ -210,43 +418,67 @@ def _mark_success():
     if g["test_done"]:
         return
     g["test_done"] = True
-    g["current_test"]["status"] = "success"
+    test = g["current_test"]
+    test["status"] = "success"
     _finish_current_test()
 
 
-def _mark_fail(message, exception=None):
-    """Mark current test as failed and proceed."""
+def _mark_fail(message, exc_info=None):
+    """Mark current test as failed and proceed.
+
+    exc_info is kept raw; it is formatted into test["exception"] only when
+    results are rendered (see _format_exception).
+    """
     if g["test_done"]:
         return
     g["test_done"] = True
-    g["current_test"]["status"] = "fail"
-    g["current_test"]["fail_message"] = message
-    g["current_test"]["exception"] = exception
+    test = g["current_test"]
+    test["status"] = "fail"
+    test["fail_message"] = message
+    test["exc_info"] = exc_info
     _finish_current_test()
 
 
-def _handle_when_current_test_times_out():
-    """Handle test timeout."""
-    g["current_timeout_after_id"] = None  # already fired
+def _handle_when_step_delay_ends(generation):
+    if _is_stale(generation):
+        return
+    _execute_current_step()
+
+
+def _handle_when_success_delay_ends(generation):
+    if _is_stale(generation):
+        return
+    _mark_success()
+
+
+def _handle_when_current_test_times_out(generation):
+    """Handle test timeout by queueing it behind any pending harness work."""
+    if _is_stale(generation) or g["test_done"]:
+        return
+    _push(_time_out_current_test)
+
+
+def _time_out_current_test():
+    """Mark current test as timed out and proceed."""
     if g["test_done"]:
         return
     g["test_done"] = True
-    g["current_test"]["status"] = "timeout"
-    g["current_test"]["fail_message"] = "Test timed out"
+    test = g["current_test"]
+    test["status"] = "timeout"
+    test["fail_message"] = "Test timed out"
     _finish_current_test()
 
 
 def _finish_current_test():
     """Clean up current test and advance to next."""
-    if g["current_timeout_after_id"]:
-        g["root"].after_cancel(g["current_timeout_after_id"])
-        g["current_timeout_after_id"] = None
+    elapsed = time.monotonic() - g["start_time"]
+    g["current_test"]["duration_ms"] = round(elapsed * 1000)
 
     if g["app_reset"]:
         g["app_reset"]()
 
     g["test_index"] += 1
-    g["root"].after(0, _advance_to_next_test)
+    _push(_advance_to_next_test)
 
 
 def get_results(flags=""):
@@ -262,33 +494,38 @@ def get_results(flags=""):
 
 
 def _get_results_text():
-    lines = []
-    counts = {}
+    lines = ["Results:"]
+    counts = collections.Counter()
+    append = lines.append
 
-    lines.append("Results:")
     for test in tests:
-        status = test.get("status") or "unknown"
-        status_u = status.upper()
-        counts[status] = counts.get(status, 0) + 1
+        status = test["status"] or "unknown"
+        counts[status] += 1
 
-        lines.append(f"  [{status_u}] {test['title']}")
-        if test.get("fail_message"):
-            lines.append(f"         {test['fail_message']}")
+        append(f"  [{status.upper()}] {test['title']}")
+        fail_message = test["fail_message"]
+        if fail_message:
+            append(kFAIL_MESSAGE_INDENT + fail_message)
 
     if tests:
-        lines.append("")
-        summary = ", ".join(
-            f"{counts.get(k, 0)} {k}"
-            for k in sorted(counts)
-        )
-        lines.append(f"Summary: {summary}")
+        append("")
+        summary = ", ".join(f"{counts[k]} {k}" for k in sorted(counts))
+        append(f"Summary: {summary}")
 
     return "\n".join(lines)
 
 
+def _format_exception(test):
+    """Format a test's raw exc_info into test["exception"], once."""
+    if test["exc_info"] is not None:
+        test["exception"] = "".join(traceback.format_exception(*test["exc_info"]))
+        test["exc_info"] = None  # release the traceback's frames
+
+
 def _get_results_json():
     rows = []
     for test in tests:
+        _format_exception(test)
         rows.append({
             "title":       test["title"],
             "steps":       [fn.__name__ for fn in test["steps"]],
@@ -296,6 +533,7 @@ def _get_results_json():
             "status":      test["status"],
             "fail_message": test["fail_message"],
             "exception":   test["exception"],
+            "duration_ms": test["duration_ms"],
         })
     return json.dumps(rows, indent=2)
 
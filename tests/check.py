@@ -12,17 +12,31 @@ import pathlib
 import sys
 
 kRESULTS_PATH = pathlib.Path(__file__).parent / "results.json"
+kTIMEOUT_MS = 500  # must match run.py
 
 expected = [
     {"title": "Explicit success",   "status": "success"},
     {"title": "Explicit fail",      "status": "fail",    "fail_message": "deliberate"},
     {"title": "Steps exhausted",    "status": "success"},
-    {"title": "Exception in step",  "status": "fail",    "fail_message": "Exception in step"},
-    {"title": "Timeout",            "status": "timeout"},
+    {"title": "Exception in step",  "status": "fail",    "fail_message": "Exception in step",
+     "exception_contains": "RuntimeError: boom"},
+    {"title": "Unknown action",     "status": "fail",    "fail_message": "Unknown action: ['next']"},
+    {"title": "Timeout",            "status": "timeout", "min_duration_ms": kTIMEOUT_MS},
+    {"title": "Delay after timeout", "status": "success"},
+    {"title": "Next 0 yields to Tk", "status": "success"},
     {"title": "Wait then succeed",  "status": "success"},
     {"title": "Goto then succeed",  "status": "success"},
+    {"title": "Configure rejects unknown key", "status": "success"},
     {"title": "Unexpected quit",    "status": "fail",    "fail_message": "app called quit() unexpectedly during test"},
     {"title": "Expected quit",      "status": "success"},
+    {"title": "Quit on last inline step", "status": "fail", "fail_message": "app called quit() unexpectedly during test"},
+    {"title": "Delay after inline quit",  "status": "success"},
+    {"title": "Synchronous steps",  "status": "success"},
+    {"title": "Synchronous goto",   "status": "success"},
+    {"title": "Synchronous wait",   "status": "fail",    "fail_message": "Synchronous test step asked for a delay: wait"},
+    {"title": "Synchronous delayed next",    "status": "fail", "fail_message": "Synchronous test step asked for a delay: next"},
+    {"title": "Synchronous delayed success", "status": "fail", "fail_message": "Synchronous test step asked for a delay: success"},
+    {"title": "Synchronous timeout", "status": "timeout"},
 ]
 
 
@@ -48,6 +62,17 @@ def check():
             ok = False
             reasons.append(f"fail_message: expected {exp['fail_message']!r}, got {result['fail_message']!r}")
 
+        if not isinstance(result["duration_ms"], int):
+            ok = False
+            reasons.append(f"duration_ms: expected an int, got {result['duration_ms']!r}")
+        elif "min_duration_ms" in exp and result["duration_ms"] < exp["min_duration_ms"]:
+            ok = False
+            reasons.append(f"duration_ms: expected at least {exp['min_duration_ms']}, got {result['duration_ms']}")
+
+        if "exception_contains" in exp and exp["exception_contains"] not in (result["exception"] or ""):
+            ok = False
+            reasons.append(f"exception: expected to contain {exp['exception_contains']!r}, got {result['exception']!r}")
+
         if ok:
             print(f"  [PASS] {exp['title']}")
             passed += 1
@@ -46,12 +46,32 @@ def test_exception_in_step():
     return [step]
 
 
+def test_unknown_action():
+    def step():
+        return (["next"], None)
+    return [step]
+
+
 def test_timeout():
     def step():
         return ("wait", 50)
     return [step]
 
 
+def test_next_zero_yields_to_tk():
+    state = {"updated": False}
+    def mark_updated():
+        state["updated"] = True
+    def step_defer_update():
+        harness.g["root"].after(0, mark_updated)
+        return ("next", 0)
+    def step_verify_update():
+        if state["updated"]:
+            return ("success", None)
+        return ("fail", "deferred update not seen")
+    return [step_defer_update, step_verify_update]
+
+
 def test_wait_then_succeed():
     state = {"waited": False}
     def step():
@@ -72,6 +92,19 @@ def test_goto_then_succeed():
     return [step]
 
 
+def test_configure_rejects_unknown_key():
+    def step():
+        before = dict(harness.g)
+        try:
+            harness.configure({"timeout_ms": 1, "bogus": 1})
+        except KeyError:
+            if harness.g != before:
+                return ("fail", "configure() changed settings before rejecting")
+            return ("success", None)
+        return ("fail", "configure() accepted an unknown key")
+    return [step]
+
+
 def test_unexpected_quit():
     def step():
         harness.quit()
@@ -88,20 +121,101 @@ def test_expected_quit():
     return [step]
 
 
+def test_synchronous_steps():
+    def step_one():
+        return ("next", None)
+    def step_two():
+        return ("success", None)
+    return [step_one, step_two]
+
+
+def test_synchronous_goto():
+    state = {"count": 0}
+    def step():
+        state["count"] += 1
+        if state["count"] < 3:
+            return ("goto", 0)
+        return ("success", None)
+    return [step]
+
+
+def test_synchronous_wait():
+    def step():
+        return ("wait", 50)
+    return [step]
+
+
+def test_synchronous_delayed_next():
+    def step():
+        return ("next", 50)
+    return [step]
+
+
+def test_synchronous_delayed_success():
+    def step():
+        return ("success", 0)
+    return [step]
+
+
+def test_synchronous_timeout():
+    def step():
+        return ("goto", 0)
+    return [step]
+
+
+def test_quit_on_last_inline_step():
+    def step_next():
+        return ("next", None)
+    def step_quit():
+        harness.quit()
+        return ("next", None)
+    return [step_next] * (harness.kMAX_INLINE_STEPS - 1) + [step_quit]
+
+
+def test_delayed_step_runs_on_time():
+    # Fails if a leftover callback from the previous test runs this step early
+    state = {"marked": False, "calls": 0}
+    def mark():
+        state["marked"] = True
+    def step():
+        state["calls"] += 1
+        if state["calls"] == 1:
+            harness.g["root"].after(100, mark)
+            return ("wait", 200)
+        if state["marked"]:
+            return ("success", None)
+        return ("fail", "step ran again before its delay")
+    return [step]
+
+
 # ── Main ──────────────────────────────────────────────────────────────────────
 
 if __name__ == "__main__":
-    harness.set_timeout(kTIMEOUT_MS)
-
-    harness.add_test("Explicit success",   test_explicit_success())
-    harness.add_test("Explicit fail",      test_explicit_fail())
-    harness.add_test("Steps exhausted",    test_steps_exhausted())
-    harness.add_test("Exception in step",  test_exception_in_step())
-    harness.add_test("Timeout",            test_timeout())
-    harness.add_test("Wait then succeed",  test_wait_then_succeed())
-    harness.add_test("Goto then succeed",  test_goto_then_succeed())
-    harness.add_test("Unexpected quit",    test_unexpected_quit())
-    harness.add_test("Expected quit",      test_expected_quit(), "q")
+    harness.configure({"timeout_ms": kTIMEOUT_MS})
+
+    harness.add_tests([
+        ("Explicit success",   test_explicit_success()),
+        ("Explicit fail",      test_explicit_fail()),
+        ("Steps exhausted",    test_steps_exhausted()),
+        ("Exception in step",  test_exception_in_step()),
+        ("Unknown action",     test_unknown_action()),
+        ("Timeout",            test_timeout()),
+        ("Delay after timeout", test_delayed_step_runs_on_time()),
+        ("Next 0 yields to Tk", test_next_zero_yields_to_tk()),
+        ("Wait then succeed",  test_wait_then_succeed()),
+        ("Goto then succeed",  test_goto_then_succeed()),
+        ("Configure rejects unknown key", test_configure_rejects_unknown_key()),
+        ("Unexpected quit",    test_unexpected_quit()),
+        ("Expected quit",      test_expected_quit(), "q"),
+        ("Quit on last inline step", test_quit_on_last_inline_step()),
+        ("Delay after inline quit",  test_delayed_step_runs_on_time()),
+        ("Synchronous steps",  test_synchronous_steps(), "y"),
+        ("Synchronous goto",   test_synchronous_goto(), "y"),
+        ("Synchronous wait",   test_synchronous_wait(), "y"),
+        ("Synchronous delayed next",    test_synchronous_delayed_next(), "y"),
+        ("Synchronous delayed success", test_synchronous_delayed_success(), "y"),
+        ("Synchronous timeout", test_synchronous_timeout(), "y"),
+    ])
 
     harness.run_host(entry, "x")
 